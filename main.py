@@ -1,49 +1,127 @@
 import os
-import re
-import time
 from datetime import datetime
+from functools import lru_cache
+import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import openpyxl
 
 KEYWORD = "日産"
 OUTPUT_DIR = "output"
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "yahoo_news.xlsx")
+SEARCH_URL = "https://news.yahoo.co.jp/search?p={keyword}&ei=utf-8&categories=domestic,world,business,it,science,life,local"
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+}
+BLOCKED_URL_PATTERNS = [
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*yimg.jp/images/ads/*",
+    "*.png",
+    "*.jpg",
+    "*.gif",
+    "*.webp",
+    "*.woff2",
+]
+
+ARTICLE_CLASS = "sc-1u4589e-0"
+TITLE_CLASS = "sc-3ls169-0"
+SOURCE_CLASSES = {"sc-n3vj8g-0", "yoLqH"}
+ARTICLE_STRAINER = SoupStrainer("li", class_=lambda c: c is not None and ARTICLE_CLASS in c)
+WEEKDAY_BRACKETS = (("(", ")"), ("（", "）"))
+
+@lru_cache(maxsize=None)
+def get_chromedriver_path() -> str:
+    return ChromeDriverManager().install()
+
+def strip_weekday(date_str: str) -> str:
+    for open_bracket, close_bracket in WEEKDAY_BRACKETS:
+        idx = date_str.find(open_bracket)
+        if idx != -1 and date_str[idx + 2:idx + 3] == close_bracket and date_str[idx + 1] in "月火水木金土日":
+            return (date_str[:idx] + date_str[idx + 3:]).strip()
+    return date_str.strip()
 
 def format_datetime(dt_obj):
     return dt_obj.strftime("%Y/%m/%d %H:%M")
 
-def get_yahoo_news_with_selenium(keyword: str) -> list[dict]:
+def fetch_search_html_with_requests(keyword: str) -> str:
+    res = requests.get(SEARCH_URL.format(keyword=keyword), headers=REQUEST_HEADERS, timeout=10)
+    res.raise_for_status()
+    return res.text
+
+def fetch_search_html_with_selenium(keyword: str) -> str:
     options = Options()
     options.add_argument("--headless")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-    search_url = f"https://news.yahoo.co.jp/search?p={keyword}&ei=utf-8&categories=domestic,world,business,it,science,life,local"
-    driver.get(search_url)
-    time.sleep(5)
-
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    driver.quit()
-    articles = soup.find_all("li", class_=re.compile("sc-1u4589e-0"))
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    options.page_load_strategy = "eager"
+    driver = webdriver.Chrome(service=Service(get_chromedriver_path()), options=options)
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        driver.get(SEARCH_URL.format(keyword=keyword))
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, f"li[class*='{ARTICLE_CLASS}']"))
+            )
+        except TimeoutException:
+            print("⚠️ 記事一覧の読み込みがタイムアウトしました")
+        page_source = driver.page_source
+    finally:
+        driver.quit()
+    return page_source
+
+def find_article_tags(article: Tag) -> tuple:
+    title_tag = link_tag = time_tag = source_tag = None
+    for tag in article.descendants:
+        if not isinstance(tag, Tag):
+            continue
+        classes = tag.get("class") or []
+        if title_tag is None and tag.name == "div" and any(TITLE_CLASS in c for c in classes):
+            title_tag = tag
+        elif link_tag is None and tag.name == "a" and tag.has_attr("href"):
+            link_tag = tag
+        elif time_tag is None and tag.name == "time":
+            time_tag = tag
+        elif source_tag is None and tag.name == "div" and SOURCE_CLASSES.issubset(classes):
+            source_tag = tag
+        if title_tag and link_tag and time_tag and source_tag:
+            break
+    return title_tag, link_tag, time_tag, source_tag
+
+def parse_yahoo_news(html: str) -> list[dict]:
+    soup = BeautifulSoup(html, "lxml", parse_only=ARTICLE_STRAINER)
+    articles = soup.find_all("li", recursive=False)
     articles_data = []
 
     for article in articles:
         try:
-            title_tag = article.find("div", class_=re.compile("sc-3ls169-0"))
+            title_tag, link_tag, time_tag, source_tag = find_article_tags(article)
             title = title_tag.text.strip() if title_tag else ""
-            link_tag = article.find("a", href=True)
             url = link_tag["href"] if link_tag else ""
-            time_tag = article.find("time")
             date_str = time_tag.text.strip() if time_tag else ""
             formatted_date = ""
 
             if date_str:
-                date_str = re.sub(r'\([月火水木金土日]\)', '', date_str).strip()
+                date_str = strip_weekday(date_str)
                 try:
                     dt_obj = datetime.strptime(date_str, "%Y/%m/%d %H:%M")
                     formatted_date = format_datetime(dt_obj)
@@ -51,13 +129,11 @@ def get_yahoo_news_with_selenium(keyword: str) -> list[dict]:
                     formatted_date = date_str
 
             source_text = ""
-            source_tag = article.find("div", class_="sc-n3vj8g-0 yoLqH")
-            if source_tag:
-                inner = source_tag.find("div", class_="sc-110wjhy-8 bsEjY")
-                if inner and inner.span:
-                    candidate = inner.span.text.strip()
-                    if not candidate.isdigit():
-                        source_text = candidate
+            source_span = source_tag.select_one("div.sc-110wjhy-8.bsEjY span") if source_tag else None
+            if source_span:
+                candidate = source_span.text.strip()
+                if not candidate.isdigit():
+                    source_text = candidate
 
             if title and url:
                 articles_data.append({
@@ -69,6 +145,19 @@ def get_yahoo_news_with_selenium(keyword: str) -> list[dict]:
         except:
             continue
 
+    return articles_data
+
+def get_yahoo_news(keyword: str) -> list[dict]:
+    articles_data = []
+    try:
+        articles_data = parse_yahoo_news(fetch_search_html_with_requests(keyword))
+    except requests.RequestException as e:
+        print(f"⚠️ requestsでの取得に失敗しました: {e}")
+
+    if not articles_data:
+        print("ℹ️ Seleniumで再取得します")
+        articles_data = parse_yahoo_news(fetch_search_html_with_selenium(keyword))
+
     print(f"✅ Yahoo!ニュース件数: {len(articles_data)} 件")
     return articles_data
 
@@ -76,9 +165,8 @@ def save_to_excel(articles: list[dict], filepath: str):
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Yahoo"
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Yahoo")
 
     headers = ["タイトル", "URL", "投稿日", "引用元"]
     ws.append(headers)
@@ -90,6 +178,6 @@ def save_to_excel(articles: list[dict], filepath: str):
     print(f"✅ Excelに保存しました: {filepath}")
 
 if __name__ == "__main__":
-    yahoo_news_articles = get_yahoo_news_with_selenium(KEYWORD)
+    yahoo_news_articles = get_yahoo_news(KEYWORD)
     if yahoo_news_articles:
         save_to_excel(yahoo_news_articles, OUTPUT_FILE)